@@ -15,20 +15,50 @@ Example:
     >>> pr2pdf.generate_pdf(["https://github.com/owner/repo/pull/123"])
 """
 
+from typing import Callable
+
+from .html_options import HTMLOptions
 from .pull_request import PullRequest
+from .style import STYLESHEET
 
 
-def collate_as_html(pull_requests: list[PullRequest]) -> str:
+def collate_as_html(
+    pull_requests: list[PullRequest], options: HTMLOptions | None = None
+) -> str:
     """Generate HTML content from GitHub Pull Requests.
 
     Args:
         pull_requests (list[PullRequest]): List of pull request objects
+        options (HTMLOptions | None, optional): Rendering options. Defaults to None.
 
     Returns:
         str: Combined HTML content of all pull requests
     """
-    return "".join(pr.to_html() for pr in pull_requests)
+    return STYLESHEET + "".join(pr.to_html(options) for pr in pull_requests)
+
+
+def write_collated(
+    pull_requests: list[PullRequest],
+    sink: Callable[[str], object],
+    options: HTMLOptions | None = None,
+) -> None:
+    """Stream HTML content of GitHub Pull Requests to a sink.
+
+    Unlike `collate_as_html`, fragments are passed on as soon as they are
+    rendered, so neither the combined document nor a complete pull request
+    is held in memory.
+
+    Args:
+        pull_requests (list[PullRequest]): List of pull request objects
+        sink (Callable[[str], object]): Called with each HTML fragment in order,
+            e.g. the `write` method of a text file
+        options (HTMLOptions | None, optional): Rendering options. Defaults to None.
+    """
+    sink(STYLESHEET)
+    for pr in pull_requests:
+        for fragment in pr.iter_html(options):
+            sink(fragment)
 
 
 __version__ = "0.0.1"
-__all__ = ["collate_as_html", "PullRequest"]
+__all__ = ["collate_as_html", "write_collated", "HTMLOptions", "PullRequest"]
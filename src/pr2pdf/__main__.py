@@ -1,11 +1,19 @@
 import argparse
 import os
+import shutil
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cache
+from typing import TYPE_CHECKING
 
-import pdfkit
+from . import HTMLOptions, PullRequest, write_collated
+from .cache import PullRequestCache, default_cache_dir
+from .graphql import fetch_bulk
 
-from . import PullRequest, collate_as_html
+if TYPE_CHECKING:
+    from pdfkit.configuration import Configuration
 
 
 def main() -> None:
@@ -13,10 +21,15 @@ def main() -> None:
 
     Command-line Arguments:
         pr_urls (list[str]): List of GitHub pull request URLs
-        --token (str, optional): GitHub Personal Access Token.
+        --token (str, optional): GitHub Personal Access Token. May be repeated
+            or comma-separated to spread requests over several tokens.
             If not provided, will try GHP_TOKEN env var or GitHub CLI auth.
         --output-path (str, optional): Path where the PDF should be saved.
             If not provided, uses current date as filename.
+        --jobs (int, optional): Number of pull requests fetched concurrently.
+        --no-cache (bool, optional): Do not use the on-disk cache of GitHub responses
+            and pull requests.
+        --show-created-at (bool, optional): Show when each pull request was opened.
 
     Creates:
         {output_path or current_date}.pdf: Combined PDF file containing all PR details
@@ -33,8 +46,9 @@ def main() -> None:
     parser.add_argument(
         "-t",
         "--token",
-        default=os.environ.get("GHP_TOKEN"),
-        help="GitHub Personal Access Token (optional if GHP_TOKEN env var is set, or will be redirected to GitHub CLI)",
+        action="append",
+        help="GitHub Personal Access Token; repeat or separate with commas to round-robin "
+        "over several tokens (optional if GHP_TOKEN env var is set, or will be redirected to GitHub CLI)",
     )
     parser.add_argument(
         "-o",
@@ -42,31 +56,118 @@ def main() -> None:
         required=False,
         help="Path where the PDF should be saved (defaults to current date)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=8,
+        help="Number of pull requests to fetch concurrently",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not use or update the cache of GitHub responses and pull requests "
+        f"in {default_cache_dir()}",
+    )
+    parser.add_argument(
+        "--show-created-at",
+        action="store_true",
+        help="Show when each pull request was opened (in KST)",
+    )
 
     args = parser.parse_args()
 
     # Try to get token from environment variable if not provided
-    if not args.token:
-        args.token = get_token_from_gh_cli()
+    if not args.token and os.environ.get("GHP_TOKEN"):
+        args.token = [os.environ["GHP_TOKEN"]]
+    tokens = [token for arg in args.token or [] for token in arg.split(",") if token]
+    if not tokens:
+        tokens = [get_token_from_gh_cli()]
 
-    # Fetch all pull requests
-    pull_requests = []
+    # Imported here so that argument errors and --help do not pay for it
+    from .session import make_adapter, make_session
+
+    # One session per token; pull requests are spread over them round-robin.
+    # The sessions share a single pool of keep-alive connections.
+    jobs = max(1, args.jobs)
+    cache_dir = None if args.no_cache else default_cache_dir()
+    # Each pull request fetches up to four endpoints at once
+    adapter = make_adapter(pool_maxsize=4 * jobs)
+    sessions = [
+        make_session(
+            token,
+            cache_dir=cache_dir,
+            adapter=adapter,
+            on_rate_limit=print_rate_limit_notice,
+        )
+        for token in tokens
+    ]
+    # Pull requests that did not change since the last run are not fetched again
+    pr_cache = None if cache_dir is None else PullRequestCache(cache_dir)
+
+    pr_refs = []
     for pr_url in args.pr_urls:
         try:
-            print(f"Fetching {pr_url} ...")
-            pull_requests.append(PullRequest.fetch(pr_url, args.token))
+            repo, pr_number = PullRequest.parse_url(pr_url)
+            owner, name = repo.split("/")
+            pr_refs.append((pr_url, (owner, name, int(pr_number))))
         except ValueError as e:
             print(f"Error parsing URL {pr_url}: {e}")
+
+    # Fetch details, reviews and commits of all pull requests in a single GraphQL query.
+    # Pull requests missing from the response are fetched from the REST API,
+    # which also reports why they could not be fetched.
+    try:
+        nodes = fetch_bulk(sessions[0], [ref for _, ref in pr_refs])
+    except Exception as e:
+        print(f"Error fetching pull requests via GraphQL, falling back to REST: {e}")
+        nodes = [None] * len(pr_refs)
+
+    # Fetch the remaining data concurrently, keeping the order of the given URLs
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = []
+        for i, ((pr_url, _), node) in enumerate(zip(pr_refs, nodes)):
+            print(f"Fetching {pr_url} ...")
+            session = sessions[i % len(sessions)]
+            if node is None:
+                future = executor.submit(
+                    PullRequest.fetch, pr_url, session=session, cache=pr_cache
+                )
+            else:
+                future = executor.submit(
+                    PullRequest.from_graphql,
+                    node,
+                    pr_url,
+                    session=session,
+                    cache=pr_cache,
+                )
+            futures.append(future)
+
+    pull_requests = []
+    for (pr_url, _), future in zip(pr_refs, futures):
+        try:
+            pull_requests.append(future.result())
         except Exception as e:
             print(f"Error processing {pr_url}: {e}")
 
     # Generate the combined PDF file
     if pull_requests:
-        html_content = collate_as_html(pull_requests)
-        output_path = write_as_pdf(html_content, output_path=args.output_path)
+        output_path = write_as_pdf(
+            pull_requests,
+            output_path=args.output_path,
+            options=HTMLOptions(show_created_at=args.show_created_at),
+        )
         print(f"PDF successfully generated: {output_path}")
 
 
+def print_rate_limit_notice(remaining: int) -> None:
+    """Tell that requests are slowed down because the rate limit is nearly used up."""
+    print(
+        f"GitHub rate limit nearly used up ({remaining} requests left), "
+        "slowing down requests until it resets ..."
+    )
+
+
 def get_token_from_gh_cli() -> str:
     """Get GitHub token from GitHub CLI authentication.
 
@@ -99,13 +200,41 @@ def get_token_from_gh_cli() -> str:
         raise Exception("GitHub CLI (gh) not found. Please install it first.")
 
 
-def write_as_pdf(html_content: str, *, output_path: str | None = None) -> str:
-    """Write HTML content to a PDF file.
+@cache
+def get_pdfkit_configuration() -> "Configuration":
+    """Get the pdfkit configuration, locating wkhtmltopdf only once.
+
+    Without an explicit configuration, pdfkit spawns a `which wkhtmltopdf`
+    subprocess for every conversion. The executable is looked up on PATH
+    in-process instead, and the configuration is reused for the rest of the run.
+
+    Returns:
+        Configuration: pdfkit configuration pointing at the wkhtmltopdf binary
+
+    Raises:
+        IOError: If wkhtmltopdf is not installed
+    """
+    import pdfkit
+
+    return pdfkit.configuration(wkhtmltopdf=shutil.which("wkhtmltopdf") or "")
+
+
+def write_as_pdf(
+    pull_requests: list[PullRequest],
+    *,
+    output_path: str | None = None,
+    options: HTMLOptions | None = None,
+) -> str:
+    """Write GitHub Pull Requests to a PDF file.
+
+    The HTML of the pull requests is streamed to a temporary file, which
+    wkhtmltopdf then reads directly.
 
     Args:
-        html_content (str): HTML content to convert to PDF
+        pull_requests (list[PullRequest]): List of pull request objects
         output_path (str | None, optional): Path where the PDF should be saved.
             If None, uses the current date as filename. Defaults to None.
+        options (HTMLOptions | None, optional): Rendering options. Defaults to None.
 
     Returns:
         str: Path to the generated PDF file
@@ -117,9 +246,21 @@ def write_as_pdf(html_content: str, *, output_path: str | None = None) -> str:
         today = datetime.now().strftime("%Y-%m-%d")
         output_path = f"{today}.pdf"
 
+    import pdfkit
+
     print(f"Writing PDF to {output_path} ...")
-    if not pdfkit.from_string(html_content, output_path):
-        raise RuntimeError("Failed to generate PDF")
+    fp = tempfile.NamedTemporaryFile(
+        "w", suffix=".html", encoding="utf-8", delete=False
+    )
+    try:
+        with fp:
+            write_collated(pull_requests, fp.write, options)
+        if not pdfkit.from_file(
+            fp.name, output_path, configuration=get_pdfkit_configuration()
+        ):
+            raise RuntimeError("Failed to generate PDF")
+    finally:
+        os.remove(fp.name)
 
     return output_path
 
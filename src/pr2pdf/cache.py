@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any
+
+
+def default_cache_dir() -> str:
+    """Get the directory where pr2pdf keeps its caches.
+
+    Returns:
+        str: `$XDG_CACHE_HOME/pr2pdf`, or `~/.cache/pr2pdf` if it is not set
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "pr2pdf")
+
+
+def _write_atomic(path: str, text: str) -> None:
+    """Write a file so that concurrent readers never see a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, encoding="utf-8", delete=False
+    ) as fp:
+        fp.write(text)
+    os.replace(fp.name, path)
+
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    """Write JSON to a file so that concurrent readers never see a partial file."""
+    _write_atomic(path, json.dumps(data))
+
+
+def _read_json(path: str) -> Any | None:
+    """Read JSON from a file, returning None if it is missing or corrupt."""
+    try:
+        with open(path, encoding="utf-8") as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+
+class ResponseCache:
+    """On-disk cache of HTTP responses keyed by URL, stored one file per URL."""
+
+    def __init__(self, cache_dir: str) -> None:
+        self.directory = os.path.join(cache_dir, "http")
+
+    def _path(self, url: str) -> str:
+        return os.path.join(
+            self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json"
+        )
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        """Get the cached response for a URL.
+
+        Args:
+            url (str): Full request URL including the query string
+
+        Returns:
+            dict[str, Any] | None: Entry with "etag", "headers", "body" and
+                "expires" keys, or None if the URL is not cached
+        """
+        return _read_json(self._path(url))
+
+    def put(
+        self,
+        url: str,
+        etag: str,
+        headers: dict[str, str],
+        body: str,
+        max_age: int = 0,
+    ) -> None:
+        """Store a response for a URL.
+
+        Args:
+            url (str): Full request URL including the query string
+            etag (str): ETag of the response
+            headers (dict[str, str]): Response headers to restore on a cache hit
+            body (str): Response body
+            max_age (int, optional): Seconds the response may be used without
+                revalidation. Defaults to 0.
+        """
+        _write_json_atomic(
+            self._path(url),
+            {
+                "etag": etag,
+                "headers": headers,
+                "body": body,
+                "expires": time.time() + max_age,
+            },
+        )
+
+    @staticmethod
+    def is_fresh(entry: dict[str, Any]) -> bool:
+        """Check whether a cached entry may be used without revalidation."""
+        return entry.get("expires", 0) > time.time()
+
+
+class PullRequestCache:
+    """On-disk cache of fetched pull requests, stored one file per pull request.
+
+    Entries hold the serialized `PullRequest`. Whether an entry is still
+    current is decided by the caller, by comparing it with freshly fetched details.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.directory = os.path.join(cache_dir, "prs")
+
+    def _path(self, repo: str, pr_number: str) -> str:
+        key = f"{repo}#{pr_number}"
+        return os.path.join(
+            self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+        )
+
+    def get(self, repo: str, pr_number: str) -> str | None:
+        """Get the cached pull request.
+
+        Args:
+            repo (str): Repository in "owner/name" format
+            pr_number (str): Pull request number
+
+        Returns:
+            str | None: JSON of the pull request, or None if it is not cached
+        """
+        try:
+            with open(self._path(repo, pr_number), encoding="utf-8") as fp:
+                return fp.read()
+        except OSError:
+            return None
+
+    def put(self, repo: str, pr_number: str, data: str) -> None:
+        """Store a pull request.
+
+        Args:
+            repo (str): Repository in "owner/name" format
+            pr_number (str): Pull request number
+            data (str): JSON of the pull request
+        """
+        _write_atomic(self._path(repo, pr_number), data)
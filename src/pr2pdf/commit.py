@@ -1,10 +1,11 @@
 from dataclasses import dataclass
+from typing import Any
 
 from .github_user import GitHubUser
 from .time import Time
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Commit:
     """Represents a single commit in a pull request."""
 
@@ -12,3 +13,38 @@ class Commit:
     message: str
     author: GitHubUser
     date: Time
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> "Commit":
+        """Create a commit from an entry of the GitHub "list PR commits" API."""
+        commit = data["commit"]
+        user = data["author"]
+        return cls(
+            sha=data["sha"],
+            message=commit["message"],
+            # Authors whose email is not linked to a GitHub account have no user
+            author=(
+                GitHubUser(login=user["login"], html_url=user["html_url"])
+                if user
+                else GitHubUser(login=commit["author"]["name"], html_url="")
+            ),
+            date=Time(commit["author"]["date"]),
+        )
+
+    @classmethod
+    def from_graphql(cls, node: dict[str, Any]) -> "Commit":
+        """Create a commit from a GraphQL `PullRequestCommit` node."""
+        commit = node["commit"]
+        author = commit["author"]
+        user = author["user"]
+        return cls(
+            sha=commit["oid"],
+            message=commit["message"],
+            # Authors whose email is not linked to a GitHub account have no user
+            author=(
+                GitHubUser(login=user["login"], html_url=user["url"])
+                if user
+                else GitHubUser(login=author["name"], html_url="")
+            ),
+            date=Time(commit["authoredDate"]),
+        )
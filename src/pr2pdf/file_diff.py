@@ -1,10 +1,103 @@
 import re
-from typing import Optional
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
 
-from pydantic import BaseModel
+# Escapes text for HTML in a single pass over the string
+_HTML_TRANSLATE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}
+)
 
+_HUNK_RE = re.compile(r"@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@")
 
-class FileDiff(BaseModel):
+# Classifies every rendered line of a patch in one scan; the name of the
+# matching group selects the renderer. File headers (+++/---) and any other
+# lines do not match and are skipped.
+_LINE_RE = re.compile(
+    r"^(?:(?P<hunk>@@.*)"
+    r"|(?P<add>\+(?!\+\+).*)"
+    r"|(?P<del>-(?!--).*)"
+    r"|(?P<ctx> .*)"
+    r"|(?P<no_newline>\\ No newline at end of file))$",
+    re.MULTILINE,
+)
+
+# Lines before the first hunk header are not part of the diff
+_FIRST_HUNK_RE = re.compile(r"^@@", re.MULTILINE)
+
+_HEADER = (
+    '<div class="file"><div class="file-header">'
+    "<strong>{filename}</strong>"
+    '<span class="file-status status-{status}">{status_label}</span>'
+    "</div>"
+)
+
+# Row renderers for each kind of patch line, called with
+# (old line number, new line number, line text)
+_ROW_RENDERERS: dict[str, Callable[[int, int, str], str]] = {
+    "hunk": lambda old, new, line: (
+        '<tr class="diff-hunk"><td colspan="2" class="gutter">...</td>'
+        f"<td><pre>{line}</pre></td></tr>"
+    ),
+    "add": lambda old, new, line: (
+        f'<tr class="diff-add"><td class="num"></td><td class="num">{new}</td>'
+        f'<td class="code"><pre>{line}</pre></td></tr>'
+    ),
+    "del": lambda old, new, line: (
+        f'<tr class="diff-del"><td class="num">{old}</td><td class="num"></td>'
+        f'<td class="code"><pre>{line}</pre></td></tr>'
+    ),
+    "ctx": lambda old, new, line: (
+        f'<tr><td class="num">{old}</td><td class="num">{new}</td>'
+        f"<td><pre>{line}</pre></td></tr>"
+    ),
+    "no_newline": lambda old, new, line: (
+        '<tr class="diff-eof"><td colspan="2" class="gutter"></td>'
+        f"<td><pre>{line}</pre></td></tr>"
+    ),
+}
+
+
+def _diff_lines(patch: str) -> list[tuple[str, int, int, str]]:
+    """Classify the lines of a patch and number them.
+
+    Args:
+        patch (str): Unified diff of a single file as returned by GitHub
+
+    Returns:
+        list[tuple[str, int, int, str]]: (kind, old line number, new line number,
+            line text) for every rendered line. `kind` is a key of `_ROW_RENDERERS`.
+            The numbers are those of the following line for hunk headers.
+    """
+    lines = []
+    append = lines.append
+    first_hunk = _FIRST_HUNK_RE.search(patch)
+    if first_hunk is None:
+        return lines
+
+    old = new = 0
+    for match in _LINE_RE.finditer(patch, first_hunk.start()):
+        kind = match.lastgroup
+        line = match.group()
+        if kind == "ctx":
+            append((kind, old, new, line))
+            old += 1
+            new += 1
+        elif kind == "add":
+            append((kind, old, new, line))
+            new += 1
+        elif kind == "del":
+            append((kind, old, new, line))
+            old += 1
+        else:
+            if kind == "hunk":
+                header = _HUNK_RE.search(line)
+                old, new = (int(header[1]), int(header[2])) if header else (0, 0)
+            append((kind, old, new, line))
+    return lines
+
+
+@dataclass(slots=True)
+class FileDiff:
     """Class representing a file difference in a pull request."""
 
     filename: str
@@ -12,88 +105,40 @@ class FileDiff(BaseModel):
     patch: Optional[str] = None
 
     def to_html(self) -> str:
-        """Convert the file diff to a GitHub-style HTML format."""
-        status_colors = {
-            "added": "#28a745",
-            "modified": "#dbab09",
-            "removed": "#d73a49",
-            "renamed": "#007bff",
-        }
-        status_style = (
-            f"color: {status_colors.get(self.status, '#000')}; font-weight: bold;"
-        )
+        """Convert the file diff to a GitHub-style HTML format.
 
-        html = f"""
-        <div style="border: 1px solid #ddd; border-radius: 6px; margin-bottom: 16px; font-family: monospace;">
-            <div style="background-color: #f6f8fa; padding: 8px 16px; border-bottom: 1px solid #ddd; display: flex; justify-content: space-between; align-items: center;">
-                <strong style="font-size: 14px;">{self.filename}</strong>
-                <span style="{status_style}">{self.status.capitalize()}</span>
-            </div>
+        The markup relies on the classes defined in `style.STYLESHEET`.
         """
+        return "".join(self.iter_html())
+
+    def iter_html(self) -> Iterator[str]:
+        """Generate the GitHub-style HTML of the file diff in fragments.
+
+        Yields:
+            str: Consecutive fragments of the `to_html` output
+        """
+        yield _HEADER.format(
+            filename=self.filename.translate(_HTML_TRANSLATE),
+            status=self.status,
+            status_label=self.status.capitalize(),
+        )
 
         if not self.patch:
-            html += "</div>"
-            return html
-
-        html += '<table style="width: 100%; border-collapse: collapse;"><tbody>'
-
-        old_line_num = 0
-        new_line_num = 0
-        hunk_started = False
-
-        for line in self.patch.split('\n'):
-            if line.startswith("@@"):
-                hunk_started = True
-                match = re.search(r"@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@", line)
-                if match:
-                    old_line_num = int(match.group(1))
-                    new_line_num = int(match.group(2))
-                else:
-                    old_line_num = 0
-                    new_line_num = 0
-
-                html += f"""
-                <tr>
-                    <td colspan="2" style="background-color: #f1f8ff; color: #586069; padding: 4px 8px; border-top: 1px solid #ddd; border-bottom: 1px solid #ddd; width: 80px;">...</td>
-                    <td style="background-color: #f1f8ff; color: #586069; padding: 4px 8px; border-top: 1px solid #ddd; border-bottom: 1px solid #ddd;"><pre style="margin: 0;">{line}</pre></td>
-                </tr>
-                """
-            elif hunk_started:
-                if line.startswith("+") and not line.startswith("+++"):
-                    html += f"""
-                    <tr>
-                        <td style="background-color: #cdffd8; text-align: right; padding: 0 8px; color: #586069; width: 40px;"></td>
-                        <td style="background-color: #cdffd8; text-align: right; padding: 0 8px; color: #586069; width: 40px;">{new_line_num}</td>
-                        <td style="background-color: #e6ffed; padding: 0 8px;"><pre style="margin: 0; color: #24292e;">{line}</pre></td>
-                    </tr>
-                    """
-                    new_line_num += 1
-                elif line.startswith("-") and not line.startswith("---"):
-                    html += f"""
-                    <tr>
-                        <td style="background-color: #ffdce0; text-align: right; padding: 0 8px; color: #586069; width: 40px;">{old_line_num}</td>
-                        <td style="background-color: #ffdce0; text-align: right; padding: 0 8px; color: #586069; width: 40px;"></td>
-                        <td style="background-color: #ffeef0; padding: 0 8px;"><pre style="margin: 0; color: #24292e;">{line}</pre></td>
-                    </tr>
-                    """
-                    old_line_num += 1
-                elif line.startswith(" "):
-                    html += f"""
-                    <tr>
-                        <td style="text-align: right; padding: 0 8px; color: #586069; width: 40px;">{old_line_num}</td>
-                        <td style="text-align: right; padding: 0 8px; color: #586069; width: 40px;">{new_line_num}</td>
-                        <td style="padding: 0 8px;"><pre style="margin: 0; color: #24292e;">{line}</pre></td>
-                    </tr>
-                    """
-                    old_line_num += 1
-                    new_line_num += 1
-                elif line == "\\ No newline at end of file":
-                    html += f"""
-                    <tr>
-                        <td colspan="2" style="background-color: #fafbfc; color: #586069; padding: 4px 8px; border-top: 1px solid #ddd; width: 80px;"></td>
-                        <td style="background-color: #fafbfc; color: #586069; padding: 4px 8px; border-top: 1px solid #ddd;"><pre style="margin: 0;">{line}</pre></td>
-                    </tr>
-                    """
-
-        html += "</tbody></table></div>"
-        return html
+            yield "</div>"
+            return
+
+        yield '<table class="diff"><tbody>'
+
+        # Escaping never touches the line prefixes that classify a line, so
+        # the whole patch is escaped at once instead of line by line
+        renderers = _ROW_RENDERERS
+        yield "".join(
+            [
+                renderers[kind](old, new, line)
+                for kind, old, new, line in _diff_lines(
+                    self.patch.translate(_HTML_TRANSLATE)
+                )
+            ]
+        )
+
+        yield "</tbody></table></div>"
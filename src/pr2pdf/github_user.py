@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 
-class GitHubUser(BaseModel):
+@dataclass(slots=True, frozen=True)
+class GitHubUser:
     """Class representing a GitHub user."""
 
     login: str
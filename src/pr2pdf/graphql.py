@@ -0,0 +1,80 @@
+import json
+from typing import TYPE_CHECKING, Any
+
+from pydantic_core import from_json
+
+if TYPE_CHECKING:
+    import requests
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+PR_FRAGMENT = """
+fragment PRFields on PullRequest {
+  title
+  body
+  createdAt
+  updatedAt
+  headRefOid
+  author { login url }
+  reviews(first: 100) {
+    nodes { author { login } }
+    pageInfo { hasNextPage }
+  }
+  commits(first: 100) {
+    nodes {
+      commit { oid message authoredDate author { name user { login url } } }
+    }
+    pageInfo { hasNextPage }
+  }
+}
+"""
+
+
+def build_bulk_query(pr_refs: list[tuple[str, str, int]]) -> str:
+    """Build a GraphQL query fetching several pull requests at once.
+
+    Each pull request is selected under its own alias (`pr0`, `pr1`, ...)
+    and shares the `PRFields` fragment.
+
+    Args:
+        pr_refs (list[tuple[str, str, int]]): List of (owner, repo name, PR number)
+
+    Returns:
+        str: GraphQL query document
+    """
+    selections = "".join(
+        f"pr{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+        f"{{ pullRequest(number: {number}) {{ ...PRFields }} }}\n"
+        for i, (owner, name, number) in enumerate(pr_refs)
+    )
+    return f"query {{\n{selections}}}\n{PR_FRAGMENT}"
+
+
+def fetch_bulk(
+    session: "requests.Session", pr_refs: list[tuple[str, str, int]]
+) -> list[dict[str, Any] | None]:
+    """Fetch details, reviews and commits of several pull requests in a single request.
+
+    Args:
+        session (requests.Session): Authenticated GitHub session
+        pr_refs (list[tuple[str, str, int]]): List of (owner, repo name, PR number)
+
+    Returns:
+        list[dict[str, Any] | None]: `PullRequest` nodes in the order of `pr_refs`.
+            An entry is None if that pull request could not be resolved
+            (e.g. it does not exist or is not accessible).
+
+    Raises:
+        Exception: If the GraphQL request itself fails
+    """
+    if not pr_refs:
+        return []
+
+    response = session.post(GRAPHQL_URL, json={"query": build_bulk_query(pr_refs)})
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch PR details: {response.json()}")
+
+    data = from_json(response.content).get("data") or {}
+    return [
+        (data.get(f"pr{i}") or {}).get("pullRequest") for i in range(len(pr_refs))
+    ]
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class HTMLOptions:
+    """Options for rendering pull requests to HTML."""
+
+    show_created_at: bool = False  # Show when the PR was opened, in KST
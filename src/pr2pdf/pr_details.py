@@ -9,16 +9,43 @@ class PRDetails(BaseModel):
     title: str
     body: str | None
     created_at: str
+    updated_at: str
     user: GitHubUser
     api_url: str = Field(alias="_links")
+    head_sha: str
 
     @model_validator(mode="before")
     def extract_api_url(cls, values: dict[str, Any]) -> dict[str, Any]:
-        """Extract api_url from _links structure before model creation."""
+        """Extract api_url and head_sha from nested structures before model creation."""
         if isinstance(values.get("_links"), dict):
             values["_links"] = values["_links"]["self"]["href"]
+        if isinstance(values.get("head"), dict):
+            values["head_sha"] = values["head"]["sha"]
         return values
 
+    @classmethod
+    def from_graphql(cls, node: dict[str, Any], api_url: str) -> "PRDetails":
+        """Create PR details from a GraphQL `PullRequest` node.
+
+        Args:
+            node (dict[str, Any]): `PullRequest` node with the `PRFields` fragment
+            api_url (str): REST API URL of the pull request
+
+        Returns:
+            PRDetails: Details in the same shape as the REST API provides
+        """
+        # Deleted accounts have no author; GitHub shows them as "ghost"
+        author = node["author"] or {"login": "ghost", "url": "https://github.com/ghost"}
+        return cls(
+            title=node["title"],
+            body=node["body"] or None,
+            created_at=node["createdAt"],
+            updated_at=node["updatedAt"],
+            user=GitHubUser(login=author["login"], html_url=author["url"]),
+            _links=api_url,
+            head_sha=node["headRefOid"],
+        )
+
     @property
     def author_login(self) -> str:
         """Get the author's login name."""
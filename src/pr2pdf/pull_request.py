@@ -1,13 +1,154 @@
-import requests
-from markdown import markdown
-from pydantic import BaseModel
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
+from html import escape
+from string import Template
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TypeVar
+from urllib.parse import parse_qs, quote, urlsplit
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import from_json
 from typing_extensions import Self
 
 from .commit import Commit
 from .file_diff import FileDiff
-from .github_user import GitHubUser
+from .html_options import HTMLOptions
 from .pr_details import PRDetails
-from .time import Time
+from .time import convert_to_kst
+
+if TYPE_CHECKING:
+    import mistune
+    import requests
+
+    from .cache import PullRequestCache
+
+
+# owner, repo and number of a pull request URL; trailing paths, query strings
+# and fragments (e.g. /files#diff-...) are allowed
+_PR_URL_RE = re.compile(
+    r"^https?://github\.com/(?P<owner>[^/?#]+)/(?P<repo>[^/?#]+)"
+    r"/pull/(?P<number>\d+)(?:[/?#]|$)"
+)
+
+# Layout of a single pull request up to its file diffs;
+# the classes are defined in style.STYLESHEET
+_PR_HEADER_TEMPLATE = Template(
+    "<h1>$title</h1>"
+    "<div class='meta'>"
+    "<p><strong>Author:</strong> <a href='$author_url'>$author_login</a></p>"
+    "$created_at"
+    "<p><strong>Reviewers:</strong> $reviewers</p>"
+    "</div>"
+    "<h2>Overview</h2>"
+    "<hr class='section'>"
+    "<div class='markdown-body overview'>$overview</div>"
+    "<h2>Files Changed</h2>"
+    "<hr class='section'>"
+)
+
+# A black divider at the end of the PR
+_PR_FOOTER = "<hr class='pr-end'>"
+
+
+# Decodes a page of the "list PR files" API straight from the response bytes,
+# without building the intermediate dicts of every file
+_FILE_LIST = TypeAdapter(list[FileDiff])
+
+
+def _escape_url(url: str) -> str:
+    """Percent-encode a URL and escape it for use in an HTML attribute."""
+    return escape(quote(url, safe=":/?&=#%"))
+
+
+@lru_cache(maxsize=1024)
+def _user_link(login: str, html_url: str) -> str:
+    """Render a link to a GitHub user, reusing it for users that appear repeatedly.
+
+    Commit authors without a GitHub account have no profile URL; only their
+    name is rendered.
+    """
+    if not html_url:
+        return escape(login)
+    return f"<a href='{_escape_url(html_url)}'>{escape(login)}</a>"
+
+
+T = TypeVar("T")
+
+
+def _page_number(url: str) -> int:
+    """Get the `page` query parameter of a paginated GitHub API URL."""
+    return int(parse_qs(urlsplit(url).query)["page"][0])
+
+
+def _fetch_pages(
+    session: "requests.Session",
+    url: str,
+    name: str,
+    decode: Callable[[bytes], list[T]],
+) -> list[T]:
+    """Fetch all pages of a paginated GitHub API list.
+
+    The first page tells how many pages there are (`Link: rel="last"`),
+    so the remaining pages are requested concurrently.
+
+    Args:
+        session (requests.Session): Authenticated GitHub session
+        url (str): URL of the list endpoint
+        name (str): What is being fetched, used in error messages
+        decode (Callable[[bytes], list[T]]): Decodes the body of a page
+
+    Returns:
+        list[T]: Items of all pages in order
+
+    Raises:
+        Exception: If a page cannot be fetched
+    """
+
+    def fetch_page(page: int) -> "requests.Response":
+        response = session.get(url, params={"per_page": 100, "page": page})
+        if response.status_code != 200:
+            raise Exception(f"Failed to fetch PR {name}: {response.json()}")
+        return response
+
+    response = fetch_page(1)
+    pages = [decode(response.content)]
+    last = response.links.get("last")
+    if last is not None:
+        last_page = _page_number(last["url"])
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            pages.extend(
+                decode(response.content)
+                for response in executor.map(fetch_page, range(2, last_page + 1))
+            )
+    else:
+        # Without a "last" link, follow "next" links one page at a time
+        page = 1
+        while "next" in response.links:
+            page += 1
+            response = fetch_page(page)
+            pages.append(decode(response.content))
+
+    return [item for page_items in pages for item in page_items]
+
+
+@cache
+def _get_markdown() -> "mistune.Markdown":
+    """Create the Markdown parser on first use, as importing mistune is slow."""
+    import mistune
+
+    # Raw HTML in PR descriptions is passed through, as GitHub renders it too.
+    # Only the GitHub Flavored Markdown extensions are enabled; fenced code
+    # blocks keep their language as a "language-*" class.
+    return mistune.create_markdown(
+        escape=False,
+        plugins=["table", "strikethrough", "url", "task_lists", "footnotes"],
+    )
+
+
+@lru_cache(maxsize=1024)
+def _render_markdown(text: str) -> str:
+    """Render Markdown text to HTML, reusing the result for repeated text."""
+    return _get_markdown()(text)
 
 
 class PullRequest(BaseModel):
@@ -25,7 +166,8 @@ class PullRequest(BaseModel):
         Args:
             url (str): GitHub pull request URL in format:
                 https://github.com/owner/repo/pull/number
-                Trailing slashes and additional paths are ignored
+                Trailing slashes, additional paths, query strings and
+                fragments are ignored
 
         Returns:
             tuple[str, str]: Tuple containing:
@@ -35,35 +177,146 @@ class PullRequest(BaseModel):
         Raises:
             ValueError: If URL format is invalid, with explanation
         """
-        try:
-            # Remove trailing slash if present
-            url = url.rstrip("/")
-
-            # Split URL into parts
-            parts = url.split("/")
-
-            # Basic validation
-            if len(parts) < 7 or parts[2] != "github.com" or parts[5] != "pull":
-                raise ValueError
-
-            repo = f"{parts[3]}/{parts[4]}"
-            pr_number = parts[6]
-
-            return repo, pr_number
-
-        except (IndexError, ValueError):
+        match = _PR_URL_RE.match(url)
+        if match is None:
             raise ValueError(
                 "Invalid GitHub PR URL. Expected format: "
                 "https://github.com/owner/repo/pull/number"
             )
+        return f"{match['owner']}/{match['repo']}", match["number"]
 
     @classmethod
-    def fetch(cls, pr_url: str, token: str) -> Self:
+    def fetch(
+        cls,
+        pr_url: str,
+        token: str | None = None,
+        *,
+        session: "requests.Session | None" = None,
+        cache: "PullRequestCache | None" = None,
+    ) -> Self:
         """Fetch pull request data from GitHub API.
 
         Args:
             pr_url (str): GitHub pull request URL
-            token (str): GitHub personal access token
+            token (str | None, optional): GitHub personal access token.
+                Only used when no session is given, in which case a session
+                shared by all fetches with this token is used. Defaults to None.
+            session (requests.Session | None, optional): Session shared across
+                fetches, e.g. created by `make_session`. Defaults to None.
+            cache (PullRequestCache | None, optional): Cache of previously
+                fetched pull requests. If given, the details are fetched first,
+                and the remaining endpoints only if the pull request changed
+                since it was cached. Defaults to None.
+
+        Returns:
+            Self: Complete pull request data including details, files, and reviewers
+
+        Raises:
+            ValueError: If URL format is invalid or neither token nor session is given
+            Exception: If any GitHub API requests fail with error details
+        """
+        repo, pr_number = cls.parse_url(pr_url)
+        if session is None:
+            if token is None:
+                raise ValueError("Either token or session is required")
+            from .session import get_session
+
+            session = get_session(token)
+        base_url = f"https://api.github.com/repos/{repo}/pulls/{pr_number}"
+
+        # The endpoints are independent, so they are requested concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            details = executor.submit(cls._fetch_details, session, base_url)
+            if cache is not None:
+                cached = cls._from_cache(cache, repo, pr_number, details.result())
+                if cached is not None:
+                    return cached
+            files = executor.submit(cls._fetch_files, session, base_url)
+            reviewers = executor.submit(cls._fetch_reviewers, session, base_url)
+            commits = executor.submit(cls._fetch_commits, session, base_url)
+
+        pull_request = cls(
+            details=details.result(),
+            files=files.result(),
+            reviewers=reviewers.result(),
+            commits=commits.result(),
+        )
+        if cache is not None:
+            cache.put(repo, pr_number, pull_request.model_dump_json(by_alias=True))
+        return pull_request
+
+    @classmethod
+    def fetch_graphql(
+        cls,
+        pr_url: str,
+        token: str | None = None,
+        *,
+        session: "requests.Session | None" = None,
+        cache: "PullRequestCache | None" = None,
+    ) -> Self:
+        """Fetch pull request data, using the GitHub GraphQL API where possible.
+
+        Details, reviewers and commits come from a single GraphQL query.
+        File patches are not exposed by GraphQL, so files are fetched from REST.
+
+        Args:
+            pr_url (str): GitHub pull request URL
+            token (str | None, optional): GitHub personal access token.
+                Only used when no session is given, in which case a session
+                shared by all fetches with this token is used. Defaults to None.
+            session (requests.Session | None, optional): Session shared across
+                fetches, e.g. created by `make_session`. Defaults to None.
+            cache (PullRequestCache | None, optional): Cache of previously
+                fetched pull requests, used if the pull request did not change
+                since it was cached. Defaults to None.
+
+        Returns:
+            Self: Complete pull request data including details, files, and reviewers
+
+        Raises:
+            ValueError: If URL format is invalid or neither token nor session is given
+            Exception: If any GitHub API requests fail with error details
+        """
+        from .graphql import fetch_bulk
+
+        repo, pr_number = cls.parse_url(pr_url)
+        if session is None:
+            if token is None:
+                raise ValueError("Either token or session is required")
+            from .session import get_session
+
+            session = get_session(token)
+
+        owner, name = repo.split("/")
+        (node,) = fetch_bulk(session, [(owner, name, int(pr_number))])
+        if node is None:
+            raise Exception(f"Failed to fetch PR details: {repo}#{pr_number} not found")
+        return cls.from_graphql(node, pr_url, session=session, cache=cache)
+
+    @classmethod
+    def from_graphql(
+        cls,
+        node: dict[str, Any],
+        pr_url: str,
+        *,
+        session: "requests.Session",
+        cache: "PullRequestCache | None" = None,
+    ) -> Self:
+        """Build a pull request from a GraphQL `PullRequest` node.
+
+        Details, reviewers and commits are taken from the node. Files are not
+        part of the node (GraphQL does not expose file patches), so they are
+        fetched from the REST API, as are reviews or commits that do not fit
+        into the node's first page of 100.
+
+        Args:
+            node (dict[str, Any]): `PullRequest` node returned by `graphql.fetch_bulk`
+            pr_url (str): GitHub pull request URL
+            session (requests.Session): Authenticated GitHub session
+            cache (PullRequestCache | None, optional): Cache of previously
+                fetched pull requests. If the node shows that the pull request
+                did not change since it was cached, nothing else is fetched.
+                Defaults to None.
 
         Returns:
             Self: Complete pull request data including details, files, and reviewers
@@ -73,199 +326,202 @@ class PullRequest(BaseModel):
             Exception: If any GitHub API requests fail with error details
         """
         repo, pr_number = cls.parse_url(pr_url)
-        headers = {"Authorization": f"token {token}"}
         base_url = f"https://api.github.com/repos/{repo}/pulls/{pr_number}"
+        details = PRDetails.from_graphql(node, base_url)
+        if cache is not None:
+            cached = cls._from_cache(cache, repo, pr_number, details)
+            if cached is not None:
+                return cached
+
+        reviewers = {
+            review["author"]["login"]
+            for review in node["reviews"]["nodes"]
+            if review["author"]
+        }
+        commits = [Commit.from_graphql(commit) for commit in node["commits"]["nodes"]]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            files_future = executor.submit(cls._fetch_files, session, base_url)
+            reviewers_future = commits_future = None
+            if node["reviews"]["pageInfo"]["hasNextPage"]:
+                reviewers_future = executor.submit(
+                    cls._fetch_reviewers, session, base_url
+                )
+            if node["commits"]["pageInfo"]["hasNextPage"]:
+                commits_future = executor.submit(cls._fetch_commits, session, base_url)
+
+        if reviewers_future is not None:
+            reviewers = reviewers_future.result()
+        if commits_future is not None:
+            commits = commits_future.result()
+
+        pull_request = cls(
+            details=details,
+            files=files_future.result(),
+            reviewers=reviewers,
+            commits=commits,
+        )
+        if cache is not None:
+            cache.put(repo, pr_number, pull_request.model_dump_json(by_alias=True))
+        return pull_request
+
+    @classmethod
+    def _from_cache(
+        cls,
+        cache: "PullRequestCache",
+        repo: str,
+        pr_number: str,
+        details: PRDetails,
+    ) -> Self | None:
+        """Get a cached pull request if it is still current.
+
+        New commits change the head commit, and any other activity such as
+        reviews or edits of the description changes the update time.
 
-        # Fetch PR details
-        pr_response = requests.get(base_url, headers=headers)
+        Returns:
+            Self | None: The cached pull request, or None if it is missing,
+                unreadable or outdated compared to `details`
+        """
+        data = cache.get(repo, pr_number)
+        if data is None:
+            return None
+        try:
+            cached = cls.model_validate_json(data)
+        except ValidationError:
+            return None
+        if (cached.details.head_sha, cached.details.updated_at) != (
+            details.head_sha,
+            details.updated_at,
+        ):
+            return None
+        return cached
+
+    @staticmethod
+    def _fetch_details(session: "requests.Session", base_url: str) -> PRDetails:
+        """Fetch the details of a pull request."""
+        pr_response = session.get(base_url)
         if pr_response.status_code != 200:
             raise Exception(f"Failed to fetch PR details: {pr_response.json()}")
 
-        pr_details = PRDetails.model_validate(pr_response.json())
+        return PRDetails.model_validate_json(pr_response.content)
 
-        # Fetch files from the "Files changed" tab
-        files_url = f"{base_url}/files"
-        files = []
-        page = 1
-        while True:
-            files_response = requests.get(
-                files_url, headers=headers, params={"per_page": 100, "page": page}
-            )
-            if files_response.status_code != 200:
-                raise Exception(f"Failed to fetch PR files: {files_response.json()}")
-            
-            page_files = files_response.json()
-            if not page_files:
-                break
-            
-            files.extend([FileDiff.model_validate(file) for file in page_files])
-            page += 1
+    @staticmethod
+    def _fetch_files(session: "requests.Session", base_url: str) -> list[FileDiff]:
+        """Fetch files from the "Files changed" tab of a pull request."""
+        return _fetch_pages(
+            session, f"{base_url}/files", "files", _FILE_LIST.validate_json
+        )
 
-        # Fetch reviewers
-        reviews_url = f"https://api.github.com/repos/{repo}/pulls/{pr_number}/reviews"
-        reviews_response = requests.get(reviews_url, headers=headers)
-        if reviews_response.status_code != 200:
-            raise Exception(f"Failed to fetch PR reviews: {reviews_response.json()}")
-
-        reviews = reviews_response.json()
-        reviewers = {review["user"]["login"] for review in reviews}
-
-        # Fetch commits
-        commits_url = f"https://api.github.com/repos/{repo}/pulls/{pr_number}/commits"
-        commits_response = requests.get(commits_url, headers=headers)
-        if commits_response.status_code != 200:
-            raise Exception(f"Failed to fetch PR commits: {commits_response.json()}")
-
-        commits_data = commits_response.json()
-        commits = [
-            Commit(
-                sha=commit["sha"],
-                message=commit["commit"]["message"],
-                author=GitHubUser(
-                    login=commit["author"]["login"],
-                    html_url=commit["author"]["html_url"],
-                ),
-                date=Time(commit["commit"]["author"]["date"]),
-            )
-            for commit in commits_data
-        ]
+    @staticmethod
+    def _fetch_reviewers(session: "requests.Session", base_url: str) -> set[str]:
+        """Fetch the logins of everyone who reviewed a pull request."""
+        reviews = _fetch_pages(session, f"{base_url}/reviews", "reviews", from_json)
+        return {review["user"]["login"] for review in reviews}
 
-        return cls(
-            details=pr_details,
-            files=files,
-            reviewers=reviewers,
-            commits=commits,
+    @staticmethod
+    def _fetch_commits(session: "requests.Session", base_url: str) -> list[Commit]:
+        """Fetch the commits of a pull request."""
+        return _fetch_pages(
+            session,
+            f"{base_url}/commits",
+            "commits",
+            lambda content: [Commit.from_api(commit) for commit in from_json(content)],
         )
 
-    def to_html(self) -> str:
+    def to_html(self, options: HTMLOptions | None = None) -> str:
         """Generate HTML content for the pull request.
 
+        Args:
+            options (HTMLOptions | None, optional): Rendering options.
+                If None, the defaults of `HTMLOptions` are used. Defaults to None.
+
         Returns:
             str: HTML string containing formatted PR information with:
-                - Title and metadata (author, date, reviewers)
+                - Title and metadata (author, optional creation date, reviewers)
                 - PR description in Markdown
                 - File changes with syntax highlighting
+            The markup relies on the classes defined in `style.STYLESHEET`.
         """
-        markdown_styles = """
-            <style>
-                .markdown-body h1, .markdown-body h2, .markdown-body h3, .markdown-body h4, .markdown-body h5, .markdown-body h6 {
-                    border-bottom: 1px solid #eaecef;
-                    padding-bottom: .3em;
-                }
-                .markdown-body ul {
-                    list-style-type: disc;
-                    list-style-position: inside;
-                }
-                .markdown-body ol {
-                    list-style-type: decimal;
-                    list-style-position: inside;
-                }
-                .markdown-body ul, .markdown-body ol {
-                    padding-left: 2em;
-                }
-                .markdown-body blockquote {
-                    border-left: .25em solid #dfe2e5;
-                    color: #6a737d;
-                    padding: 0 1em;
-                    margin-left: 0;
-                }
-                .markdown-body pre {
-                    background-color: #f6f8fa;
-                    border-radius: 3px;
-                    font-size: 85%;
-                    line-height: 1.45;
-                    overflow: auto;
-                    padding: 16px;
-                }
-                .markdown-body code {
-                    background-color: rgba(27,31,35,.05);
-                    border-radius: 3px;
-                    font-size: 85%;
-                    margin: 0;
-                    padding: .2em .4em;
-                }
-                .markdown-body pre > code {
-                    background-color: transparent;
-                    font-size: 100%;
-                    margin: 0;
-                    padding: 0;
-                    border: 0;
-                }
-            </style>
-        """
+        return "".join(self.iter_html(options))
+
+    def iter_html(self, options: HTMLOptions | None = None) -> Iterator[str]:
+        """Generate HTML content for the pull request in fragments.
 
-        html_content = f"<h1>{self.details.title}</h1>"
+        Each file diff is rendered only when its fragments are consumed, so
+        writing the fragments out keeps a single file's HTML in memory at a time.
+
+        Args:
+            options (HTMLOptions | None, optional): Rendering options.
+                If None, the defaults of `HTMLOptions` are used. Defaults to None.
+
+        Yields:
+            str: Consecutive fragments of the `to_html` output
+        """
+        if options is None:
+            options = HTMLOptions()
 
         # Author, Created At, and Reviewers in a single box
+        created_at = (
+            f"<p><strong>Created At:</strong> {convert_to_kst(self.details.created_at)}</p>"
+            if options.show_created_at
+            else ""
+        )
         reviewers_links = (
             ", ".join(
                 [
-                    f"<a href='https://github.com/{reviewer}'>{reviewer}</a>"
+                    _user_link(reviewer, f"https://github.com/{reviewer}")
                     for reviewer in self.reviewers
                 ]
             )
             if self.reviewers
             else "No reviewers"
         )
-        html_content += (
-            f"<div style='background-color: #f6f8fa; padding: 15px; border: 1px solid #ddd; border-radius: 6px; margin-bottom: 20px;'>"
-            f"<p><strong>Author:</strong> <a href='{self.details.author_url}'>{self.details.author_login}</a></p>"
-            f"<p><strong>Reviewers:</strong> {reviewers_links}</p>"
-            f"</div>"
-        )
 
         # Render Markdown in the "Overview" section
-        pr_description_html = ""
+        overview: list[str] = []
         if self.details.body:
-            body_parts = self.details.body.split("Key Changes:")
-            pr_description_html = markdown(body_parts[0], extensions=["extra"])
-
-            if len(body_parts) > 1:
-                key_changes_content = body_parts[1].strip()
-                key_changes_lines = key_changes_content.split('\n')
-                key_changes_html_list = []
-                for line in key_changes_lines:
-                    stripped_line = line.strip()
-                    if stripped_line.startswith('*'):
-                        key_changes_html_list.append(f"<li>{stripped_line[1:].strip()}</li>")
-                    else:
-                        key_changes_html_list.append(f"<p>{stripped_line}</p>") # Handle non-list lines
-                
-                if key_changes_html_list:
-                    pr_description_html += "<h3>Key Changes:</h3><ul>" + "".join(key_changes_html_list) + "</ul>"
-                else:
-                    pr_description_html += f"<h3>Key Changes:</h3><p>{key_changes_content}</p>"
-        
-        commit_html_list = []
+            description, key_changes_heading, key_changes = self.details.body.partition(
+                "Key Changes:"
+            )
+            overview.append(_render_markdown(description))
+
+            if key_changes_heading:
+                overview.append("<h3>Key Changes:</h3><ul>")
+                # "*" lines become list items; other lines are kept as paragraphs.
+                # Unlike the description, this section is not rendered as
+                # Markdown, so its text is escaped.
+                overview.extend(
+                    [
+                        f"<li>{escape(line[1:].lstrip())}</li>"
+                        if line[:1] == "*"
+                        else f"<p>{escape(line)}</p>"
+                        for line in map(str.strip, key_changes.strip().split("\n"))
+                    ]
+                )
+                overview.append("</ul>")
+
+        overview.append("<h3>Commits</h3><ul>")
         for commit in self.commits:
-            lines = commit.message.strip().split('\n')
-            subject = lines[0]
-            body_lines = lines[1:]
-
-            commit_item_html = f"<li>{subject} - <small><a href='{commit.author.html_url}'>{commit.author.login}</a> ({commit.date.to_kst_str()})</small>"
-            if body_lines:
-                body = '\n'.join(filter(str.strip, body_lines))
+            subject, _, body = commit.message.strip().partition("\n")
+            author = commit.author
+            overview.append(
+                f"<li>{escape(subject)} - <small>{_user_link(author.login, author.html_url)} ({commit.date.to_kst_str()})</small>"
+            )
+            if body:
+                body = "\n".join(filter(str.strip, body.split("\n")))
                 if body:
-                    commit_item_html += f"<pre style=\"margin-left: 2em;\">{body}</pre>"
-            commit_item_html += "</li>"
-            commit_html_list.append(commit_item_html)
-
-        commit_messages_html = f"<h3>Commits</h3><ul>{''.join(commit_html_list)}</ul>"
-
-        body_html = pr_description_html + commit_messages_html
-        html_content += "<h2>Overview</h2>"
-        html_content += "<hr style='border: 1px solid #ddd; margin: 10px 0;'>"
-        html_content += (
-            f"<div class='markdown-body' style='background-color: #fff; padding: 15px; border: 1px solid #ddd; border-radius: 6px; margin-bottom: 20px;'>"
-            f"{markdown_styles}{body_html}</div>"
+                    overview.append(f"<pre class='commit-body'>{escape(body)}</pre>")
+            overview.append("</li>")
+        overview.append("</ul>")
+
+        yield _PR_HEADER_TEMPLATE.substitute(
+            title=escape(self.details.title),
+            author_url=_escape_url(self.details.author_url),
+            author_login=escape(self.details.author_login),
+            created_at=created_at,
+            reviewers=reviewers_links,
+            overview="".join(overview),
         )
-
-        html_content += "<h2>Files Changed</h2>"
-        html_content += "<hr style='border: 1px solid #ddd; margin: 10px 0;'>"
-
         for file in self.files:
-            html_content += file.to_html()
-
-        # Add a black divider at the end of the PR
-        html_content += "<hr style='border: 2px solid black; margin: 40px 0;'>"
-        return html_content
\ No newline at end of file
+            yield from file.iter_html()
+        yield _PR_FOOTER
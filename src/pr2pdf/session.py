@@ -0,0 +1,263 @@
+import re
+import threading
+import time
+from functools import cache
+from typing import Any, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import ResponseCache
+
+GITHUB_API_URL = "https://api.github.com/"
+
+# Retry transient gateway errors and secondary rate limits (429) of idempotent
+# requests with exponential backoff, waiting for Retry-After when it is given
+_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+
+# Below this many remaining requests, requests are spread out until the rate
+# limit resets instead of using up the rest at once
+_RATE_LIMIT_LOW = 50
+_MAX_RATE_LIMIT_WAIT = 60.0
+
+# Response headers restored on a cache hit; Link carries the pagination
+_CACHED_HEADERS = ("Content-Type", "Link")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _max_age(response: requests.Response) -> int:
+    """Get the number of seconds a response may be reused without revalidation."""
+    cache_control = response.headers.get("Cache-Control", "")
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    return int(match[1]) if match else 0
+
+
+class _RateLimitPacer:
+    """Schedule slowing down requests when the rate limit is nearly used up.
+
+    Based on the `X-RateLimit-Remaining` and `X-RateLimit-Reset` headers of
+    responses, the remaining requests are spread over the time until the
+    limit resets, at most `_MAX_RATE_LIMIT_WAIT` seconds apart. All threads
+    using a session share one schedule: before a request is sent, it reserves
+    the next free slot and waits for it without holding a connection.
+    """
+
+    def __init__(self, on_rate_limit: Callable[[int], None] | None = None) -> None:
+        self._lock = threading.Lock()
+        self._next_request = 0.0
+        self._interval = 0.0
+        self._pacing = False
+        self._on_rate_limit = on_rate_limit
+
+    def wait(self) -> None:
+        """Wait for the next free slot of the schedule, if requests are paced."""
+        with self._lock:
+            if not self._pacing:
+                return
+            now = time.time()
+            slot = max(self._next_request, now)
+            self._next_request = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record(self, response: requests.Response, *args: Any, **kwargs: Any) -> None:
+        """Response hook updating the schedule from the rate limit headers."""
+        # Conditional requests answered with 304 do not count against the limit
+        if response.status_code == 304:
+            return
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        remaining_requests = int(remaining)
+        with self._lock:
+            if not 0 < remaining_requests < _RATE_LIMIT_LOW:
+                self._pacing = False
+                return
+            started = not self._pacing
+            self._pacing = True
+            self._interval = min(
+                max(int(reset) - time.time(), 0) / remaining_requests,
+                _MAX_RATE_LIMIT_WAIT,
+            )
+        if started and self._on_rate_limit is not None:
+            self._on_rate_limit(remaining_requests)
+
+
+class GitHubSession(requests.Session):
+    """Session that slows down requests when the rate limit is nearly used up.
+
+    Requests wait for their slot of a `_RateLimitPacer` before they are sent,
+    so a waiting request does not hold on to a pooled connection.
+    """
+
+    def __init__(self, on_rate_limit: Callable[[int], None] | None = None) -> None:
+        super().__init__()
+        self.pacer = _RateLimitPacer(on_rate_limit)
+        self.hooks["response"].append(self.pacer.record)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.pacer.wait()
+        return super().send(request, **kwargs)
+
+
+class ETagSession(GitHubSession):
+    """Session that answers GET requests from a cache of responses.
+
+    Successful GET responses that carry an ETag are stored in a `ResponseCache`.
+    While a stored response is fresh according to its `Cache-Control: max-age`,
+    it is returned without contacting GitHub at all. After that, requests for
+    the same URL send the ETag as `If-None-Match`. When GitHub answers
+    `304 Not Modified`, which has no body and does not count against the rate
+    limit, the cached body is returned as a regular 200 response.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        on_rate_limit: Callable[[int], None] | None = None,
+    ) -> None:
+        super().__init__(on_rate_limit)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if request.method != "GET" or request.url is None:
+            return super().send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self._cached_response(request, entry)
+        if entry is not None:
+            request.headers["If-None-Match"] = entry["etag"]
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            response.status_code = 200
+            response._content = entry["body"].encode("utf-8")
+            for name, value in entry["headers"].items():
+                response.headers.setdefault(name, value)
+            # The revalidated entry is fresh again for the new max-age
+            max_age = _max_age(response)
+            if max_age:
+                self.cache.put(
+                    request.url, entry["etag"], entry["headers"], entry["body"], max_age
+                )
+        elif response.status_code == 200 and "ETag" in response.headers:
+            self.cache.put(
+                request.url,
+                response.headers["ETag"],
+                {
+                    name: response.headers[name]
+                    for name in _CACHED_HEADERS
+                    if name in response.headers
+                },
+                response.text,
+                _max_age(response),
+            )
+        return response
+
+    @staticmethod
+    def _cached_response(
+        request: requests.PreparedRequest, entry: dict[str, Any]
+    ) -> requests.Response:
+        """Build a 200 response from a cache entry without sending the request."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = request.url or ""
+        response.request = request
+        response.encoding = "utf-8"
+        response._content = entry["body"].encode("utf-8")
+        response.headers.update(entry["headers"])
+        return response
+
+
+def make_adapter(pool_maxsize: int = 20) -> HTTPAdapter:
+    """Create a pool of keep-alive connections to the GitHub API.
+
+    Connections do not depend on the token, whose Authorization header is sent
+    with every request, so one adapter can be mounted on the sessions of several
+    tokens. They then share open connections instead of each opening their own.
+    Requests wait for a free connection when all of them are in use, which
+    bounds the number of concurrent requests to `pool_maxsize`.
+
+    Args:
+        pool_maxsize (int, optional): Maximum number of connections kept open
+            per host, and thus of concurrent requests.
+            Defaults to 20.
+
+    Returns:
+        HTTPAdapter: Adapter retrying requests that fail with a 429, 502, 503
+            or 504 up to three times
+    """
+    return HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=pool_maxsize,
+        max_retries=_RETRY,
+        pool_block=True,
+    )
+
+
+def make_session(
+    token: str,
+    *,
+    pool_maxsize: int = 20,
+    cache_dir: str | None = None,
+    adapter: HTTPAdapter | None = None,
+    on_rate_limit: Callable[[int], None] | None = None,
+) -> requests.Session:
+    """Create an HTTP session for the GitHub API.
+
+    The session keeps connections to api.github.com alive and reuses them
+    across requests, so only the first request pays for the TCP/TLS handshake.
+    Requests failing with a 429, 502, 503 or 504 are retried up to three times,
+    and requests are slowed down when the rate limit is nearly used up.
+
+    Args:
+        token (str): GitHub personal access token
+        pool_maxsize (int, optional): Maximum number of connections kept open
+            per host, and thus of concurrent requests.
+            Ignored if `adapter` is given. Defaults to 20.
+        cache_dir (str | None, optional): Directory for caching GET responses
+            by ETag (see `ETagSession`). If None, nothing is cached.
+            Defaults to None.
+        adapter (HTTPAdapter | None, optional): Connection pool to use, e.g.
+            one shared with the sessions of other tokens (see `make_adapter`).
+            If None, the session gets its own. Defaults to None.
+        on_rate_limit (Callable[[int], None] | None, optional): Called with the
+            number of remaining requests when requests start being slowed down.
+            Defaults to None.
+
+    Returns:
+        requests.Session: Session with GitHub authorization headers set
+    """
+    if cache_dir is None:
+        session = GitHubSession(on_rate_limit)
+    else:
+        session = ETagSession(ResponseCache(cache_dir), on_rate_limit)
+    session.headers.update(
+        {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+        }
+    )
+    session.mount(GITHUB_API_URL, adapter or make_adapter(pool_maxsize))
+    return session
+
+
+@cache
+def get_session(token: str) -> requests.Session:
+    """Get a session for the GitHub API shared by all callers using the same token.
+
+    Args:
+        token (str): GitHub personal access token
+
+    Returns:
+        requests.Session: Session created by `make_session` on first use
+    """
+    return make_session(token)
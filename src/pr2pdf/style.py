@@ -0,0 +1,109 @@
+# Stylesheet shared by every pull request in a document. It is emitted once
+# at the top of the document, so the HTML of each pull request and file diff
+# only refers to these classes instead of repeating inline styles.
+STYLESHEET = """
+<style>
+    .meta {
+        background-color: #f6f8fa;
+        padding: 15px;
+        border: 1px solid #ddd;
+        border-radius: 6px;
+        margin-bottom: 20px;
+    }
+    .overview {
+        background-color: #fff;
+        padding: 15px;
+        border: 1px solid #ddd;
+        border-radius: 6px;
+        margin-bottom: 20px;
+    }
+    .markdown-body h1, .markdown-body h2, .markdown-body h3,
+    .markdown-body h4, .markdown-body h5, .markdown-body h6 {
+        border-bottom: 1px solid #eaecef;
+        padding-bottom: .3em;
+    }
+    .markdown-body ul {
+        list-style-type: disc;
+        list-style-position: inside;
+    }
+    .markdown-body ol {
+        list-style-type: decimal;
+        list-style-position: inside;
+    }
+    .markdown-body ul, .markdown-body ol { padding-left: 2em; }
+    .markdown-body blockquote {
+        border-left: .25em solid #dfe2e5;
+        color: #6a737d;
+        padding: 0 1em;
+        margin-left: 0;
+    }
+    .markdown-body pre {
+        background-color: #f6f8fa;
+        border-radius: 3px;
+        font-size: 85%;
+        line-height: 1.45;
+        overflow: auto;
+        padding: 16px;
+    }
+    .markdown-body code {
+        background-color: rgba(27,31,35,.05);
+        border-radius: 3px;
+        font-size: 85%;
+        margin: 0;
+        padding: .2em .4em;
+    }
+    .markdown-body pre > code {
+        background-color: transparent;
+        font-size: 100%;
+        margin: 0;
+        padding: 0;
+        border: 0;
+    }
+    .commit-body { margin-left: 2em; }
+    hr.section { border: 1px solid #ddd; margin: 10px 0; }
+    hr.pr-end { border: 2px solid black; margin: 40px 0; }
+    .file {
+        border: 1px solid #ddd;
+        border-radius: 6px;
+        margin-bottom: 16px;
+        font-family: monospace;
+    }
+    .file-header {
+        background-color: #f6f8fa;
+        padding: 8px 16px;
+        border-bottom: 1px solid #ddd;
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+    }
+    .file-header strong { font-size: 14px; }
+    .file-status { color: #000; font-weight: bold; }
+    .status-added { color: #28a745; }
+    .status-modified { color: #dbab09; }
+    .status-removed { color: #d73a49; }
+    .status-renamed { color: #007bff; }
+    .diff { width: 100%; border-collapse: collapse; }
+    .diff td { padding: 0 8px; }
+    .diff pre { margin: 0; color: #24292e; }
+    .diff .num { text-align: right; color: #586069; width: 40px; }
+    .diff .gutter { width: 80px; }
+    .diff-add .num { background-color: #cdffd8; }
+    .diff-add .code { background-color: #e6ffed; }
+    .diff-del .num { background-color: #ffdce0; }
+    .diff-del .code { background-color: #ffeef0; }
+    .diff-hunk td {
+        background-color: #f1f8ff;
+        color: #586069;
+        padding: 4px 8px;
+        border-top: 1px solid #ddd;
+        border-bottom: 1px solid #ddd;
+    }
+    .diff-eof td {
+        background-color: #fafbfc;
+        color: #586069;
+        padding: 4px 8px;
+        border-top: 1px solid #ddd;
+    }
+    .diff-hunk pre, .diff-eof pre { color: inherit; }
+</style>
+"""
@@ -1,14 +1,55 @@
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
 
+_KST_OFFSET_HOURS = 9  # KST is UTC+9, without daylight saving time
 
-@dataclass
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _days_in_month(year: int, month: int) -> int:
+    """Get the number of days in a month of the Gregorian calendar."""
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _DAYS_IN_MONTH[month]
+
+
+def convert_to_kst(utc_datetime: str) -> str:
+    """Convert a GitHub UTC timestamp to a KST datetime string.
+
+    GitHub timestamps always have the "YYYY-MM-DDTHH:MM:SSZ" shape, so only
+    the hour is shifted, carrying into the day, month and year when needed.
+
+    Args:
+        utc_datetime (str): UTC timestamp in format "YYYY-MM-DDTHH:MM:SSZ"
+
+    Returns:
+        str: KST datetime string in format "YYYY-MM-DD HH:MM:SS"
+    """
+    year = int(utc_datetime[0:4])
+    month = int(utc_datetime[5:7])
+    day = int(utc_datetime[8:10])
+    hour = int(utc_datetime[11:13]) + _KST_OFFSET_HOURS
+    if hour >= 24:
+        hour -= 24
+        day += 1
+        if day > _days_in_month(year, month):
+            day = 1
+            month += 1
+            if month > 12:
+                month = 1
+                year += 1
+    # Minutes and seconds are unaffected by a whole-hour offset
+    return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}{utc_datetime[13:19]}"
+
+
+@dataclass(slots=True, frozen=True)
 class Time:
     """Represents a timestamp, handling UTC to KST conversion."""
 
     utc_datetime: str
+    _kst: str = field(init=False, repr=False, compare=False)
 
-    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_kst", convert_to_kst(self.utc_datetime))
 
     def to_kst_str(self) -> str:
         """Convert UTC datetime string to KST datetime string.
@@ -16,9 +57,4 @@ class Time:
         Returns:
             KST datetime string in format "YYYY-MM-DD HH:MM:SS"
         """
-        utc_time = datetime.strptime(self.utc_datetime, "%Y-%m-%dT%H:%M:%SZ")
-        kst_time = utc_time + timedelta(hours=9)  # KST is UTC+9
-        return kst_time.strftime("%Y-%m-%d %H:%M:%S")
-
-
-
+        return self._kst